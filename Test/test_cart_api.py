@@ -1,328 +1,236 @@
-#!/usr/bin/env python3
 """
 Test script for the new Cart API endpoints
-Run this after applying migrations to test the cart functionality
 """
 
-import os
-import sys
-import django
 import json
+import logging
 
-# Setup Django environment
-sys.path.append('/home/kulriya68/Elysian/elysianBackend')
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
-# Setup Django FIRST
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elysianBackend.settings')
-django.setup()
-
-from django.test import Client
+from django.test import Client, TestCase
 from django.contrib.auth import get_user_model
 from common.models import Cart, CartItem, Product, Variant, Category
-from rest_framework.authtoken.models import Token
+from common.views.cart import cart_view
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+CART_URL = '/api/common/cart/'
+
 def setup_test_data():
     """Create test data for cart API testing"""
-    print("🔧 Setting up test data...")
-    
-    # Create test user
-    user, created = User.objects.get_or_create(
+    logger.debug("🔧 Setting up test data...")
+
+    # Everything is created inside the class transaction on an empty
+    # database, so none of it can already exist: insert straight away
+    # instead of looking each row up first
+    user = User.objects.create(
         mobile_number='9999999999',
-        defaults={
-            'first_name': 'Test',
-            'last_name': 'User',
-            'email': 'test@example.com'
-        }
+        first_name='Test',
+        last_name='User',
+        email='test@example.com'
     )
-    
-    # Create or get token
-    token, created = Token.objects.get_or_create(user=user)
-    
+
+    # The cart view authenticates JWTs; the token is signed in-process,
+    # with no database row behind it
+    token = str(AccessToken.for_user(user))
+
     # Create test category
-    category, created = Category.objects.get_or_create(
+    category = Category.objects.create(
         name='Test Category',
-        defaults={'description': 'Test category for API testing', 'is_available': True}
+        description='Test category for API testing',
+        is_available=True
     )
-    
-    # Create test products
-    product1, created = Product.objects.get_or_create(
-        name='Test Pizza',
-        defaults={
-            'description': 'Test pizza for API testing',
-            'category': category,
-            'discount': 10.00,
-            'is_available': True
-        }
-    )
-    
-    product2, created = Product.objects.get_or_create(
-        name='Test Burger',
-        defaults={
-            'description': 'Test burger for API testing',
-            'category': category,
-            'discount': 5.00,
-            'is_available': True
-        }
-    )
-    
-    # Create test variants
-    variant1, created = Variant.objects.get_or_create(
-        product=product1,
-        size='Large',
-        defaults={
-            'price': 15.99,
-            'type': 'pizza',
-            'is_available': True
-        }
-    )
-    
-    variant2, created = Variant.objects.get_or_create(
-        product=product1,
-        size='Medium',
-        defaults={
-            'price': 12.99,
-            'type': 'pizza',
-            'is_available': True
-        }
-    )
-    
-    variant3, created = Variant.objects.get_or_create(
-        product=product2,
-        size='Regular',
-        defaults={
-            'price': 8.99,
-            'type': 'burger',
-            'is_available': True
-        }
-    )
-    
-    print(f"✅ Test data created:")
-    print(f"   User: {user.mobile_number}")
-    print(f"   Token: {token.key}")
-    print(f"   Products: {product1.name}, {product2.name}")
-    print(f"   Variants: {variant1.size}, {variant2.size}, {variant3.size}")
-    
+
+    # Create test products in one insert, then re-read them for the
+    # primary keys (MySQL does not return them)
+    Product.objects.bulk_create([
+        Product(name='Test Pizza', description='Test pizza for API testing',
+                discount=10.00, category=category, is_available=True),
+        Product(name='Test Burger', description='Test burger for API testing',
+                discount=5.00, category=category, is_available=True),
+    ])
+    products = {p.name: p for p in Product.objects.filter(category=category)}
+    product1 = products['Test Pizza']
+    product2 = products['Test Burger']
+
+    # Create test variants the same way, read back by size
+    Variant.objects.bulk_create([
+        Variant(product=product1, size='Large', price=15.99, type='pizza', is_available=True),
+        Variant(product=product1, size='Medium', price=12.99, type='pizza', is_available=True),
+        Variant(product=product2, size='Regular', price=8.99, type='burger', is_available=True),
+    ])
+    variants = {v.size: v for v in Variant.objects.filter(product__in=[product1, product2])}
+    variant1, variant2, variant3 = variants['Large'], variants['Medium'], variants['Regular']
+
+    logger.debug("✅ Test data created: user %s, products %s, %s",
+                 user.mobile_number, product1.name, product2.name)
+
     return user, token, product1, product2, variant1, variant2, variant3
 
-def test_get_empty_cart(client, token):
-    """Test GET /api/common/cart/ with empty cart"""
-    print("\n📋 Testing GET empty cart...")
-    
-    response = client.get('/api/common/cart/', HTTP_AUTHORIZATION=f'Bearer {token.key}')
-    
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    
-    assert response.status_code == 200
-    data = response.json()
-    assert data['cart_items'] == []
-    assert data['total_items'] == 0
-    assert data['total_amount'] == 0
-    
-    print("✅ Empty cart test passed")
-
-def test_add_to_cart(client, token, product1, variant1):
-    """Test POST /api/common/cart/ to add item"""
-    print("\n📦 Testing POST add to cart...")
-    
-    payload = {
-        'product_id': product1.id,
-        'variant_id': variant1.id,
-        'quantity': 2
-    }
-    
-    response = client.post(
-        '/api/common/cart/',
-        data=json.dumps(payload),
-        content_type='application/json',
-        HTTP_AUTHORIZATION=f'Bearer {token.key}'
-    )
-    
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    
-    assert response.status_code == 200
-    data = response.json()
-    assert data['message'] == 'Item added to cart successfully'
-    assert len(data['cart_items']) == 1
-    
-    cart_item = data['cart_items'][0]
-    assert cart_item['productId'] == product1.id
-    assert cart_item['productName'] == product1.name
-    assert len(cart_item['selectedVariant']) == 1
-    assert cart_item['selectedVariant'][0]['quantity'] == 2
-    
-    print("✅ Add to cart test passed")
-
-def test_add_existing_item(client, token, product1, variant1):
-    """Test adding same item again (should update quantity)"""
-    print("\n🔄 Testing POST add existing item...")
-    
-    payload = {
-        'product_id': product1.id,
-        'variant_id': variant1.id,
-        'quantity': 1
-    }
-    
-    response = client.post(
-        '/api/common/cart/',
-        data=json.dumps(payload),
-        content_type='application/json',
-        HTTP_AUTHORIZATION=f'Bearer {token.key}'
-    )
-    
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    
-    assert response.status_code == 200
-    data = response.json()
-    
-    cart_item = data['cart_items'][0]
-    assert cart_item['selectedVariant'][0]['quantity'] == 3  # 2 + 1
-    
-    print("✅ Add existing item test passed")
-
-def test_add_multiple_variants(client, token, product1, variant2):
-    """Test adding different variant of same product"""
-    print("\n🍕 Testing POST add different variant...")
-    
-    payload = {
-        'product_id': product1.id,
-        'variant_id': variant2.id,
-        'quantity': 1
-    }
-    
-    response = client.post(
-        '/api/common/cart/',
-        data=json.dumps(payload),
-        content_type='application/json',
-        HTTP_AUTHORIZATION=f'Bearer {token.key}'
-    )
-    
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    
-    assert response.status_code == 200
-    data = response.json()
-    
-    cart_item = data['cart_items'][0]
-    assert len(cart_item['selectedVariant']) == 2  # Large + Medium
-    
-    print("✅ Multiple variants test passed")
-
-def test_add_different_product(client, token, product2, variant3):
-    """Test adding different product"""
-    print("\n🍔 Testing POST add different product...")
-    
-    payload = {
-        'product_id': product2.id,
-        'variant_id': variant3.id,
-        'quantity': 1
-    }
-    
-    response = client.post(
-        '/api/common/cart/',
-        data=json.dumps(payload),
-        content_type='application/json',
-        HTTP_AUTHORIZATION=f'Bearer {token.key}'
-    )
-    
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    
-    assert response.status_code == 200
-    data = response.json()
-    
-    assert len(data['cart_items']) == 2  # Pizza + Burger
-    
-    print("✅ Different product test passed")
-
-def test_get_populated_cart(client, token):
-    """Test GET /api/common/cart/ with items"""
-    print("\n📋 Testing GET populated cart...")
-    
-    response = client.get('/api/common/cart/', HTTP_AUTHORIZATION=f'Bearer {token.key}')
-    
-    print(f"Status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data['cart_items']) > 0
-    assert data['total_items'] > 0
-    assert data['total_amount'] > 0
-    
-    print("✅ Populated cart test passed")
-
-def test_error_cases(client, token):
-    """Test error cases"""
-    print("\n❌ Testing error cases...")
-    
-    # Test missing product_id
-    response = client.post(
-        '/api/common/cart/',
-        data=json.dumps({'variant_id': 1, 'quantity': 1}),
-        content_type='application/json',
-        HTTP_AUTHORIZATION=f'Bearer {token.key}'
-    )
-    assert response.status_code == 400
-    print("✅ Missing product_id error test passed")
-    
-    # Test invalid product_id
-    response = client.post(
-        '/api/common/cart/',
-        data=json.dumps({'product_id': 99999, 'variant_id': 1, 'quantity': 1}),
-        content_type='application/json',
-        HTTP_AUTHORIZATION=f'Bearer {token.key}'
-    )
-    assert response.status_code == 404
-    print("✅ Invalid product_id error test passed")
-    
-    # Test no authentication
-    response = client.post(
-        '/api/common/cart/',
-        data=json.dumps({'product_id': 1, 'variant_id': 1, 'quantity': 1}),
-        content_type='application/json'
-    )
-    assert response.status_code == 401
-    print("✅ No authentication error test passed")
-
-def run_tests():
-    """Run all cart API tests"""
-    print("🚀 Starting Cart API Tests")
-    print("=" * 50)
-    
-    # Setup
-    user, token, product1, product2, variant1, variant2, variant3 = setup_test_data()
-    client = Client()
-    
-    # Clear any existing cart items for clean test
-    Cart.objects.filter(user=user).delete()
-    
-    try:
-        # Run tests in sequence
-        test_get_empty_cart(client, token)
-        test_add_to_cart(client, token, product1, variant1)
-        test_add_existing_item(client, token, product1, variant1)
-        test_add_multiple_variants(client, token, product1, variant2)
-        test_add_different_product(client, token, product2, variant3)
-        test_get_populated_cart(client, token)
-        test_error_cases(client, token)
-        
-        print("\n🎉 All Cart API Tests Passed!")
-        print("=" * 50)
-        
-    except AssertionError as e:
-        print(f"\n❌ Test Failed: {e}")
-        print("=" * 50)
-    except Exception as e:
-        print(f"\n💥 Unexpected Error: {e}")
-        print("=" * 50)
-
-if __name__ == "__main__":
-    run_tests()
+
+def cart_payload(variant, quantity):
+    """Encoded POST body adding a variant of its product to the cart"""
+    return json.dumps({
+        'product_id': variant.product_id,
+        'variant_id': variant.id,
+        'quantity': quantity
+    })
+
+
+class CartAPITests(TestCase):
+    """Test GET and POST on the cart endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Fixtures are built once for the class, inside the transaction Django
+        # wraps around setUpTestData, so the inserts are never committed one
+        # by one; each test starts from an empty cart as its changes roll back
+        (cls.user, cls.token, cls.product1, cls.product2,
+         cls.variant1, cls.variant2, cls.variant3) = setup_test_data()
+
+        # Request bodies reference the fixture ids, so they are encoded here,
+        # once for the class, instead of on every request
+        cls.large_pizza_x2 = cart_payload(cls.variant1, 2)
+        cls.large_pizza_x3 = cart_payload(cls.variant1, 3)
+        cls.medium_pizza_x1 = cart_payload(cls.variant2, 1)
+        cls.burger_x1 = cart_payload(cls.variant3, 1)
+        cls.missing_variant = json.dumps({'product_id': cls.product1.id, 'quantity': 1})
+        cls.unknown_variant = json.dumps({'product_id': 99999, 'variant_id': 99999, 'quantity': 1})
+        cls.large_pizza_x1 = cart_payload(cls.variant1, 1)
+
+    def setUp(self):
+        # The cart behaviour tests call the view directly with a force-
+        # authenticated request, skipping URL resolution, middleware and the
+        # JWT check; the error cases go through the full client stack, with
+        # self.client staying anonymous
+        self.factory = APIRequestFactory()
+        self.auth_client = Client(headers={'Authorization': f'Bearer {self.token}'})
+
+    def call_cart_view(self, request):
+        """Run a request through cart_view as the test user and log the response"""
+        force_authenticate(request, user=self.user)
+        response = cart_view(request)
+        logger.debug("Status: %s", response.status_code)
+        logger.debug("Response: %s", response.data)
+        return response
+
+    def get_cart(self):
+        """GET the test user's cart"""
+        return self.call_cart_view(self.factory.get(CART_URL))
+
+    def add_to_cart(self, payload):
+        """POST an encoded cart payload as the test user"""
+        return self.call_cart_view(
+            self.factory.post(CART_URL, data=payload, content_type='application/json')
+        )
+
+    def put_in_cart(self, *variants):
+        """Seed the user's cart with one of each variant through the ORM"""
+        cart = Cart.get_or_create_for_user(self.user)
+        CartItem.objects.bulk_create([
+            CartItem(cart=cart, product_id=variant.product_id, variant=variant, quantity=1)
+            for variant in variants
+        ])
+
+    def test_get_empty_cart(self):
+        """Test GET /api/common/cart/ with empty cart"""
+        logger.debug("📋 Testing GET empty cart...")
+
+        response = self.get_cart()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['cart_items'], [])
+
+    def test_add_to_cart(self):
+        """Test POST /api/common/cart/ to add item"""
+        logger.debug("📦 Testing POST add to cart...")
+
+        response = self.add_to_cart(self.large_pizza_x2)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data['message'], 'Item added to cart successfully')
+        self.assertEqual(len(data['cart_items']), 1)
+
+        cart_item = data['cart_items'][0]
+        self.assertEqual(cart_item['product_id'], self.product1.id)
+        self.assertEqual(cart_item['product_name'], self.product1.name)
+        self.assertEqual(cart_item['variant_id'], self.variant1.id)
+        self.assertEqual(cart_item['quantity'], 2)
+
+    def test_add_existing_item(self):
+        """Test adding same item again (sets the new quantity)"""
+        logger.debug("🔄 Testing POST add existing item...")
+        self.put_in_cart(self.variant1)
+
+        response = self.add_to_cart(self.large_pizza_x3)
+
+        self.assertEqual(response.status_code, 200)
+        cart_items = response.data['cart_items']
+        self.assertEqual(len(cart_items), 1)
+        self.assertEqual(cart_items[0]['quantity'], 3)
+
+    def test_add_multiple_variants(self):
+        """Test adding different variant of same product"""
+        logger.debug("🍕 Testing POST add different variant...")
+        self.put_in_cart(self.variant1)
+
+        response = self.add_to_cart(self.medium_pizza_x1)
+
+        self.assertEqual(response.status_code, 200)
+        cart_items = response.data['cart_items']
+        # Large + Medium, one row per variant
+        self.assertCountEqual(
+            [item['variant_id'] for item in cart_items],
+            [self.variant1.id, self.variant2.id]
+        )
+
+    def test_add_different_product(self):
+        """Test adding different product"""
+        logger.debug("🍔 Testing POST add different product...")
+        self.put_in_cart(self.variant1)
+
+        response = self.add_to_cart(self.burger_x1)
+
+        self.assertEqual(response.status_code, 200)
+        cart_items = response.data['cart_items']
+        # Pizza + Burger
+        self.assertCountEqual(
+            [item['product_id'] for item in cart_items],
+            [self.product1.id, self.product2.id]
+        )
+
+    def test_get_populated_cart(self):
+        """Test GET /api/common/cart/ with items"""
+        logger.debug("📋 Testing GET populated cart...")
+        self.put_in_cart(self.variant1, self.variant3)
+
+        response = self.get_cart()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data['total_items'], 2)
+        self.assertGreater(data['total_amount'], 0)
+
+    def test_error_cases(self):
+        """Test error cases"""
+        logger.debug("❌ Testing error cases...")
+
+        # Each case is independent; they run in turn because the fixture rows
+        # only exist inside this test's transaction, which other threads'
+        # database connections cannot see
+        error_cases = [
+            ('Missing variant_id', self.auth_client, self.missing_variant, 400),
+            ('Invalid variant_id', self.auth_client, self.unknown_variant, 404),
+            # self.client has neither a token nor a session
+            ('No authentication', self.client, self.large_pizza_x1, 401),
+        ]
+
+        for label, client, payload, expected_status in error_cases:
+            with self.subTest(label):
+                response = client.post(CART_URL, data=payload, content_type='application/json')
+                self.assertEqual(response.status_code, expected_status, response.content.decode())
+
+        self.assertFalse(CartItem.objects.exists())
@@ -1,223 +1,158 @@
-#!/usr/bin/env python3
 """
 Test script to verify cart quantity management including:
 - Adding items
-- Updating quantities 
+- Updating quantities
 - Removing items (quantity = 0)
 - Unified response format
 """
 
-import os
-import sys
-import django
-from django.test import Client
-import json
-
-# Setup Django
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
-# Setup Django FIRST
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elysianBackend.settings')
-django.setup()
-
-def test_cart_quantity_operations():
-    """Test all cart quantity operations"""
-    print("🛒 Testing Cart Quantity Management")
-    print("=" * 45)
-    
-    client = Client()
-    
-    # Create session
-    session_resp = client.get('/api/common/session/')
-    print(f"✅ Session created: {session_resp.status_code}")
-    
-    # Test 1: Add item with quantity 2
-    print(f"\n📦 Test 1: Add item (quantity = 2)")
-    add_resp = client.post('/api/common/cart/', {
-        'variant_id': 1,
-        'quantity': 2
-    }, content_type='application/json')
-    
-    print(f"Status: {add_resp.status_code}")
-    add_data = add_resp.json()
-    print(f"Message: {add_data['message']}")
-    print(f"Items in cart: {add_data['total_items']}")
-    if add_data['cart_items']:
-        item = add_data['cart_items'][0]
-        print(f"Item: {item['product_name']} x{item['quantity']} = ₹{item['item_total']}")
-    
-    # Test 2: Update quantity to 5
-    print(f"\n🔄 Test 2: Update quantity to 5")
-    update_resp = client.post('/api/common/cart/', {
-        'variant_id': 1,
-        'quantity': 5
-    }, content_type='application/json')
-    
-    print(f"Status: {update_resp.status_code}")
-    update_data = update_resp.json()
-    print(f"Message: {update_data['message']}")
-    if update_data['cart_items']:
-        item = update_data['cart_items'][0]
-        print(f"Updated: {item['product_name']} x{item['quantity']} = ₹{item['item_total']}")
-    
-    # Test 3: Add second item
-    print(f"\n📦 Test 3: Add second item (quantity = 1)")
-    add_resp2 = client.post('/api/common/cart/', {
-        'variant_id': 4,
-        'quantity': 1
-    }, content_type='application/json')
-    
-    print(f"Status: {add_resp2.status_code}")
-    add_data2 = add_resp2.json()
-    print(f"Message: {add_data2['message']}")
-    print(f"Total items in cart: {add_data2['total_items']}")
-    print(f"Total amount: ₹{add_data2['total_amount']}")
-    
-    # Test 4: Remove first item (quantity = 0)
-    print(f"\n🗑️  Test 4: Remove first item (quantity = 0)")
-    remove_resp = client.post('/api/common/cart/', {
-        'variant_id': 1,
-        'quantity': 0
-    }, content_type='application/json')
-    
-    print(f"Status: {remove_resp.status_code}")
-    remove_data = remove_resp.json()
-    print(f"Message: {remove_data['message']}")
-    print(f"Items remaining: {remove_data['total_items']}")
-    print(f"Total amount: ₹{remove_data['total_amount']}")
-    
-    # Test 5: Try to remove non-existent item
-    print(f"\n🧪 Test 5: Remove non-existent item")
-    remove_resp2 = client.post('/api/common/cart/', {
-        'variant_id': 1,  # Already removed
-        'quantity': 0
-    }, content_type='application/json')
-    
-    print(f"Status: {remove_resp2.status_code}")
-    remove_data2 = remove_resp2.json()
-    print(f"Message: {remove_data2['message']}")
-    print(f"Items in cart: {remove_data2['total_items']}")
-    
-    # Test 6: Remove all remaining items
-    print(f"\n🗑️  Test 6: Remove all remaining items")
-    remove_resp3 = client.post('/api/common/cart/', {
-        'variant_id': 4,
-        'quantity': 0
-    }, content_type='application/json')
-    
-    print(f"Status: {remove_resp3.status_code}")
-    remove_data3 = remove_resp3.json()
-    print(f"Message: {remove_data3['message']}")
-    print(f"Items in cart: {remove_data3['total_items']}")
-    print(f"Total amount: ₹{remove_data3['total_amount']}")
-    
-    # Test 7: Verify with GET
-    print(f"\n📥 Test 7: Verify empty cart with GET")
-    get_resp = client.get('/api/common/cart/')
-    print(f"Status: {get_resp.status_code}")
-    get_data = get_resp.json()
-    print(f"Items in cart: {get_data['total_items']}")
-    print(f"Total amount: ₹{get_data['total_amount']}")
-    
-    # Verify all responses have consistent format
-    responses = [
-        ("Add", add_data),
-        ("Update", update_data), 
-        ("Add Second", add_data2),
-        ("Remove", remove_data),
-        ("Remove Non-existent", remove_data2),
-        ("Remove All", remove_data3)
-    ]
-    
-    print(f"\n🔍 Response Format Verification")
-    print("-" * 35)
-    
-    all_consistent = True
-    expected_keys = {'message', 'cart_items', 'total_items', 'total_amount'}
-    
-    for name, response in responses:
-        response_keys = set(response.keys())
-        if response_keys == expected_keys:
-            print(f"✅ {name}: Correct format")
-        else:
-            print(f"❌ {name}: Incorrect format - {response_keys}")
-            all_consistent = False
-    
-    # Check GET response format (no message field)
-    get_keys = set(get_data.keys())
-    expected_get_keys = {'cart_items', 'total_items', 'total_amount'}
-    if get_keys == expected_get_keys:
-        print(f"✅ GET: Correct format")
-    else:
-        print(f"❌ GET: Incorrect format - {get_keys}")
-        all_consistent = False
-    
-    return all_consistent
-
-def test_negative_quantity():
-    """Test negative quantity validation"""
-    print(f"\n🚫 Testing Negative Quantity Validation")
-    print("=" * 40)
-    
-    client = Client()
-    
-    # Create session
-    session_resp = client.get('/api/common/session/')
-    
-    # Test negative quantity
-    error_resp = client.post('/api/common/cart/', {
-        'variant_id': 1,
-        'quantity': -1
-    }, content_type='application/json')
-    
-    print(f"Status: {error_resp.status_code}")
-    error_data = error_resp.json()
-    print(f"Message: {error_data['message']}")
-    print(f"Items in cart: {error_data['total_items']}")
-    
-    return error_resp.status_code == 400 and 'negative' in error_data['message']
-
-def main():
-    """Run all cart quantity management tests"""
-    print("🛒 Cart Quantity Management Tests")
-    print("=" * 50)
-    
-    tests = [
-        ("Cart Quantity Operations", test_cart_quantity_operations),
-        ("Negative Quantity Validation", test_negative_quantity),
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-                print(f"\n✅ {test_name} - PASSED")
-            else:
-                print(f"\n❌ {test_name} - FAILED")
-        except Exception as e:
-            print(f"\n❌ {test_name} - ERROR: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    print(f"\n🎯 Final Results: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("\n🎉 All Cart Quantity Management Tests Passed!")
-        print("✅ Items can be added to cart with any positive quantity")
-        print("🔄 Item quantities can be updated by setting new quantity")
-        print("🗑️  Items can be removed by setting quantity = 0")
-        print("🚫 Negative quantities are properly rejected")
-        print("📱 All responses follow unified format with appropriate messages")
-        print("📥 GET and POST responses are consistent")
-    else:
-        print("\n⚠️  Some tests failed. Check the output above.")
-    
-    print("=" * 50)
-
-if __name__ == '__main__':
-    main()
+import logging
+
+from django.db import transaction
+from django.test import Client, TestCase
+from common.models import Cart, CartItem, Category, Product, Variant
+from elysianBackend.constants import SESSION_COOKIE_NAME
+
+logger = logging.getLogger(__name__)
+
+CART_URL = '/api/common/cart/'
+SESSION_URL = '/api/common/session/'
+
+# Unified cart response format: POST adds a message to the GET fields
+GET_RESPONSE_KEYS = frozenset({'cart_items', 'total_items', 'total_amount'})
+POST_RESPONSE_KEYS = GET_RESPONSE_KEYS | {'message'}
+
+def create_test_data():
+    """Create two products with one available variant each"""
+    category = Category.objects.create(
+        name='Test Category',
+        description='Test category for cart quantity tests',
+        is_available=True,
+        type='food'
+    )
+    pizza = Product.objects.create(name='Test Pizza', category=category, discount=10.00)
+    burger = Product.objects.create(name='Test Burger', category=category, discount=0.00)
+    pizza_variant = Variant.objects.create(product=pizza, size='Large', price=15.99, type='pizza')
+    burger_variant = Variant.objects.create(product=burger, size='Regular', price=8.99, type='burger')
+    return pizza_variant, burger_variant
+
+
+class CartQuantityManagementTests(TestCase):
+    """Test adding, updating and removing cart items by quantity"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # The variants stand in for the demo fixture's variant ids 1 and 4;
+        # each test is rolled back, so every test starts with an empty cart
+        cls.variant1, cls.variant2 = create_test_data()
+
+        # The cart needs an anonymous session; create it once for the class
+        # and hand the cookie to each test's client instead of requesting a
+        # new session at the top of every test
+        session_client = Client()
+        session_resp = session_client.get(SESSION_URL)
+        logger.debug("✅ Session created: %s", session_resp.status_code)
+        cls.session_cookies = session_client.cookies
+
+    def setUp(self):
+        self.client.cookies.update(self.session_cookies)
+
+    def post_cart(self, variant, quantity, num_queries):
+        """
+        POST a variant and quantity to the cart, asserting the exact number of
+        queries it runs, and return the parsed body
+        """
+        with self.assertNumQueries(num_queries):
+            response = self.client.post(CART_URL, {
+                'variant_id': variant.id,
+                'quantity': quantity
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        return response.json()
+
+    def put_in_cart(self, *variants):
+        """Seed the session's cart with one of each variant through the ORM"""
+        cart = Cart.get_or_create_for_session(self.session_cookies[SESSION_COOKIE_NAME].value)
+        CartItem.objects.bulk_create([
+            CartItem(cart=cart, product_id=variant.product_id, variant=variant, quantity=1)
+            for variant in variants
+        ])
+
+    def test_cart_quantity_operations(self):
+        """Test adding, updating and removing one item in sequence"""
+        logger.debug("🛒 Testing Cart Quantity Management")
+
+        # Test 1: Add item with quantity 2
+        logger.debug("📦 Test 1: Add item (quantity = 2)")
+        add_data = self.post_cart(self.variant1, 2, num_queries=12)
+
+        # Test 2: Update quantity to 5
+        logger.debug("🔄 Test 2: Update quantity to 5")
+        update_data = self.post_cart(self.variant1, 5, num_queries=7)
+
+        # Test 3: Remove the item (quantity = 0)
+        logger.debug("🗑️  Test 3: Remove item (quantity = 0)")
+        remove_data = self.post_cart(self.variant1, 0, num_queries=7)
+
+        # The remove response already carries the emptied cart, so it is
+        # checked directly instead of fetching the cart again
+        for name, data in [("Add", add_data), ("Update", update_data), ("Remove", remove_data)]:
+            self.assertEqual(data.keys(), POST_RESPONSE_KEYS, name)
+
+        self.assertEqual(add_data['cart_items'][0]['quantity'], 2)
+        self.assertEqual(update_data['cart_items'][0]['quantity'], 5)
+        self.assertEqual(remove_data['total_items'], 0)
+        self.assertEqual(remove_data['total_amount'], 0)
+
+    def test_cart_get_shape(self):
+        """Test GET returns the POST fields without the message"""
+        # The same number of queries for one item and for two, so a query
+        # per cart item fails the test
+        for contents in ([self.variant1], [self.variant1, self.variant2]):
+            with self.subTest(items=len(contents)), transaction.atomic():
+                self.put_in_cart(*contents)
+
+                with self.assertNumQueries(4):
+                    get_resp = self.client.get(CART_URL)
+
+                self.assertEqual(get_resp.status_code, 200)
+                get_data = get_resp.json()
+                self.assertEqual(get_data.keys(), GET_RESPONSE_KEYS)
+                self.assertEqual(get_data['total_items'], len(contents))
+                transaction.set_rollback(True)
+
+    def test_cart_state_changes(self):
+        """Test single cart POSTs against a pre-filled cart"""
+        # Each case seeds its own cart and is rolled back afterwards, so the
+        # cases do not depend on one another's results
+        cases = [
+            # (label, cart contents, variant, quantity, queries, total_items, message)
+            ("Add second item", [self.variant1], self.variant2, 1, 9, 2, 'Item added to cart successfully'),
+            ("Remove non-existent item", [self.variant2], self.variant1, 0, 6, 1, 'Item was not in cart'),
+            ("Remove last item", [self.variant2], self.variant2, 0, 7, 0, 'Item removed from cart successfully'),
+        ]
+
+        for label, contents, variant, quantity, num_queries, total_items, message in cases:
+            with self.subTest(label), transaction.atomic():
+                self.put_in_cart(*contents)
+
+                data = self.post_cart(variant, quantity, num_queries)
+
+                self.assertEqual(data.keys(), POST_RESPONSE_KEYS)
+                self.assertEqual(data['message'], message)
+                self.assertEqual(data['total_items'], total_items)
+                transaction.set_rollback(True)
+
+    def test_negative_quantity(self):
+        """Test negative quantity validation"""
+        logger.debug("🚫 Testing Negative Quantity Validation")
+
+        # Test negative quantity
+        error_resp = self.client.post(CART_URL, {
+            'variant_id': self.variant1.id,
+            'quantity': -1
+        }, content_type='application/json')
+
+        # Only the status and message matter here, so check the raw body
+        # instead of decoding it
+        self.assertContains(error_resp, 'quantity cannot be negative', status_code=400)
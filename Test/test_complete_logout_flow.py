@@ -1,22 +1,13 @@
-#!/usr/bin/env python3
 """
 Test script to verify complete logout flow: JWT user -> logout -> anonymous session -> browsing
 """
 
-import os
-import sys
-import django
-from django.test import Client
-from django.contrib.auth import get_user_model
-
-# Setup Django
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import logging
 
-# Setup Django FIRST
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elysianBackend.settings')
-django.setup()
+from django.test import Client, TestCase
+from django.contrib.auth import get_user_model
+from common.models import Category, Product, Variant
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from elysianBackend.constants import (
     ACCESS_TOKEN_COOKIE_NAME,
@@ -26,272 +17,200 @@ from elysianBackend.constants import (
 
 User = get_user_model()
 
-def test_complete_logout_to_anonymous_flow():
-    """Test complete flow: Anonymous -> Login -> Authenticated -> Logout -> Anonymous"""
-    print("\n🔄 Testing Complete Logout to Anonymous Flow")
-    print("-" * 60)
-    
-    client = Client()
-    
-    # Phase 1: Anonymous user creates session
-    print("\n📝 Phase 1: Anonymous Session Creation")
-    session_response = client.get('/api/common/session/')
-    if session_response.status_code != 200:
-        print("❌ Anonymous session creation failed")
-        return False
-    
-    initial_session_id = session_response.cookies.get(SESSION_COOKIE_NAME)
-    if not initial_session_id:
-        print("❌ Initial session cookie not set")
-        return False
-    
-    print(f"✅ Anonymous session created: {initial_session_id.value[:8]}...")
-    
-    # Test anonymous browsing
-    menu_response = client.get('/api/restaurant/menu/')
-    if menu_response.status_code == 200:
-        print("✅ Anonymous user can browse menu")
-    else:
-        print(f"❌ Anonymous menu access failed: {menu_response.status_code}")
-        return False
-    
-    # Phase 2: User logs in
-    print("\n🔐 Phase 2: User Login")
-    login_response = client.post('/api/user/login/', {
-        'mobile_number': '9999999999',
-        'password': 'password123'
-    }, content_type='application/json')
-    
-    if login_response.status_code != 200:
-        print(f"❌ Login failed: {login_response.status_code}")
-        return False
-    
-    # Verify JWT tokens are set and session is cleared
-    access_token = login_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
-    refresh_token = login_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
-    session_after_login = login_response.cookies.get(SESSION_COOKIE_NAME)
-    
-    if not access_token or not refresh_token:
-        print("❌ JWT tokens not set after login")
-        return False
-    
-    if session_after_login and session_after_login.value == '':
-        print("✅ Session cookie cleared after login")
-    else:
-        print("⚠️  Session cookie handling after login")
-    
-    print("✅ User logged in successfully with JWT tokens")
-    
-    # Test authenticated access
-    user_response = client.get('/api/user/me/')
-    if user_response.status_code == 200:
-        user_data = user_response.json()
-        print(f"✅ Authenticated user access: {user_data.get('mobile_number', 'Unknown')}")
-    else:
-        print(f"❌ Authenticated access failed: {user_response.status_code}")
-        return False
-    
-    # Phase 3: User logs out
-    print("\n🚪 Phase 3: User Logout")
-    logout_response = client.post('/api/user/logout/')
-    
-    if logout_response.status_code != 200:
-        print(f"❌ Logout failed: {logout_response.status_code}")
-        return False
-    
-    # Verify logout response contains new session
-    logout_data = logout_response.json()
-    if 'session_id' not in logout_data:
-        print("❌ Logout response missing session_id")
-        return False
-    
-    new_session_id = logout_data['session_id']
-    print(f"✅ Logout successful, new session: {new_session_id[:8]}...")
-    
-    # Verify JWT tokens are cleared
-    access_token_after = logout_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
-    refresh_token_after = logout_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
-    new_session_cookie = logout_response.cookies.get(SESSION_COOKIE_NAME)
-    
-    access_cleared = not access_token_after or access_token_after.value == ''
-    refresh_cleared = not refresh_token_after or refresh_token_after.value == ''
-    
-    if access_cleared and refresh_cleared:
-        print("✅ JWT tokens cleared on logout")
-    else:
-        print("❌ JWT tokens not properly cleared")
-        return False
-    
-    if new_session_cookie and new_session_cookie.value == new_session_id:
-        print("✅ New session cookie set correctly")
-    else:
-        print("❌ New session cookie not set properly")
-        return False
-    
-    # Phase 4: Anonymous browsing with new session
-    print("\n🌐 Phase 4: Post-Logout Anonymous Browsing")
-    
-    # Test public endpoints work with new session
-    public_endpoints = [
-        ('/api/restaurant/menu/', 'Menu'),
-        ('/api/common/categories/', 'Categories'),
-        ('/api/common/cart/', 'Cart'),
-    ]
-    
-    for endpoint, name in public_endpoints:
-        response = client.get(endpoint)
-        if response.status_code == 200:
-            print(f"✅ {name} accessible with new session")
-        else:
-            print(f"❌ {name} failed with new session: {response.status_code}")
-            return False
-    
-    # Test that JWT-only endpoints are properly rejected
-    jwt_endpoints = [
-        ('/api/user/me/', 'User Profile'),
-        ('/api/user/addresses/', 'User Addresses'),
-    ]
-    
-    for endpoint, name in jwt_endpoints:
-        response = client.get(endpoint)
-        if response.status_code in [401, 403]:
-            print(f"✅ {name} properly rejected without JWT")
-        else:
-            print(f"❌ {name} should be rejected but got: {response.status_code}")
-            return False
-    
-    # Phase 5: Verify session continuity
-    print("\n🔗 Phase 5: Session Continuity Verification")
-    
-    # Add item to cart with new session
-    cart_add_response = client.post('/api/common/cart/', {
-        'product_id': 1,
-        'variant_id': 1,
-        'quantity': 2
-    }, content_type='application/json')
-    
-    if cart_add_response.status_code == 200:
-        print("✅ Can add items to cart with new session")
-    else:
-        print(f"⚠️  Cart add failed: {cart_add_response.status_code} (may be expected if product doesn't exist)")
-    
-    # Get cart with same session
-    cart_get_response = client.get('/api/common/cart/')
-    if cart_get_response.status_code == 200:
-        print("✅ Can retrieve cart with new session")
-    else:
-        print(f"❌ Cart retrieval failed: {cart_get_response.status_code}")
-        return False
-    
-    print("\n🎉 Complete logout to anonymous flow successful!")
-    return True
-
-def test_logout_session_isolation():
-    """Test that logout creates isolated sessions for different users"""
-    print("\n🔒 Testing Logout Session Isolation")
-    print("-" * 50)
-    
-    # Create two separate clients
-    client1 = Client()
-    client2 = Client()
-    
-    # Both clients login
-    for i, client in enumerate([client1, client2], 1):
-        session_response = client.get('/api/common/session/')
-        login_response = client.post('/api/user/login/', {
-            'mobile_number': '9999999999',
-            'password': 'password123'
-        }, content_type='application/json')
-        
-        if login_response.status_code != 200:
-            print(f"❌ Client {i} login failed")
-            return False
-    
-    print("✅ Both clients logged in")
-    
-    # Client 1 logs out
-    logout_response1 = client1.post('/api/user/logout/')
-    if logout_response1.status_code != 200:
-        print("❌ Client 1 logout failed")
-        return False
-    
-    session_id1 = logout_response1.json().get('session_id')
-    print(f"✅ Client 1 logged out, new session: {session_id1[:8]}...")
-    
-    # Client 2 logs out
-    logout_response2 = client2.post('/api/user/logout/')
-    if logout_response2.status_code != 200:
-        print("❌ Client 2 logout failed")
-        return False
-    
-    session_id2 = logout_response2.json().get('session_id')
-    print(f"✅ Client 2 logged out, new session: {session_id2[:8]}...")
-    
-    # Verify sessions are different
-    if session_id1 != session_id2:
-        print("✅ Different sessions created for different clients")
-    else:
-        print("❌ Same session ID generated (security issue)")
-        return False
-    
-    # Verify both can browse independently
-    menu_response1 = client1.get('/api/restaurant/menu/')
-    menu_response2 = client2.get('/api/restaurant/menu/')
-    
-    if menu_response1.status_code == 200 and menu_response2.status_code == 200:
-        print("✅ Both clients can browse independently")
-    else:
-        print("❌ Independent browsing failed")
-        return False
-    
-    return True
-
-def main():
-    print("🔄 Complete Logout Flow Tests")
-    print("=" * 70)
-    
-    # Ensure test user exists
-    try:
-        user = User.objects.get(mobile_number='9999999999')
-        print("✅ Using existing test user: 9999999999")
-    except User.DoesNotExist:
-        user = User.objects.create_user(
+logger = logging.getLogger(__name__)
+
+SESSION_URL = '/api/common/session/'
+
+LOGIN_PAYLOAD = {
+    'mobile_number': '9999999999',
+    'password': 'password123'
+}
+
+
+class CompleteLogoutFlowTests(TestCase):
+    """Test the authenticated -> logout -> anonymous browsing flow"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Test user the flows log in as; rolled back with the class
+        cls.user = User.objects.create_user(
             mobile_number='9999999999',
             password='password123',
             first_name='Test',
             last_name='User',
             email='test@example.com'
         )
-        print("✅ Created test user: 9999999999")
-    
-    # Run tests
-    tests = [
-        ("Complete Logout to Anonymous Flow", test_complete_logout_to_anonymous_flow),
-        ("Logout Session Isolation", test_logout_session_isolation),
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {test_name} failed")
-        except Exception as e:
-            print(f"❌ {test_name} error: {e}")
-    
-    print(f"\n🎯 Test Results: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("🎉 All Complete Logout Flow Tests Passed!")
-        print("🔒 Your logout-to-anonymous flow is working perfectly!")
-        print("✨ Users can seamlessly transition from authenticated to anonymous browsing!")
-    else:
-        print("⚠️  Some tests failed. Check the output above.")
-    
-    print("=" * 70)
-
-if __name__ == '__main__':
-    main()
+
+        # Product the post-logout session puts in its cart
+        category = Category.objects.create(name='Test Category', is_available=True)
+        product = Product.objects.create(name='Test Product', category=category,
+                                         is_available=True, discount=0)
+        cls.variant = Variant.objects.create(product=product, size='Medium', price=10.99,
+                                             type='test', is_available=True)
+
+    def setUp(self):
+        # Second browser for the isolation test; self.client is the first
+        self.other_client = Client()
+
+    def log_in(self, client):
+        """Give the client the JWT cookies a login sets, without the password check"""
+        # The login endpoint and its password hash are covered by the full
+        # flow test; tests about logout only need the logged-in state
+        refresh_token = RefreshToken.for_user(self.user)
+        client.cookies[REFRESH_TOKEN_COOKIE_NAME] = str(refresh_token)
+        client.cookies[ACCESS_TOKEN_COOKIE_NAME] = str(refresh_token.access_token)
+
+    def test_complete_logout_to_anonymous_flow(self):
+        """Test complete flow: Anonymous -> Login -> Authenticated -> Logout -> Anonymous"""
+        logger.debug("🔄 Testing Complete Logout to Anonymous Flow")
+
+        client = self.client
+
+        # Phase 1: Anonymous user creates session
+        logger.debug("📝 Phase 1: Anonymous Session Creation")
+        session_response = client.get(SESSION_URL)
+        self.assertEqual(session_response.status_code, 200, "Anonymous session creation failed")
+
+        initial_session_id = session_response.cookies.get(SESSION_COOKIE_NAME)
+        self.assertTrue(initial_session_id, "Initial session cookie not set")
+        logger.debug("✅ Anonymous session created: %s...", initial_session_id.value[:8])
+
+        # Test anonymous browsing
+        menu_response = client.get('/api/restaurant/menu/')
+        self.assertEqual(menu_response.status_code, 200, "Anonymous menu access failed")
+        logger.debug("✅ Anonymous user can browse menu")
+
+        # Phase 2: User logs in
+        logger.debug("🔐 Phase 2: User Login")
+        login_response = client.post('/api/user/login/', LOGIN_PAYLOAD, content_type='application/json')
+        self.assertEqual(login_response.status_code, 200, "Login failed")
+
+        # Verify JWT tokens are set and session is cleared
+        access_token = login_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
+        refresh_token = login_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
+        session_after_login = login_response.cookies.get(SESSION_COOKIE_NAME)
+
+        self.assertTrue(access_token and refresh_token, "JWT tokens not set after login")
+        # delete_cookie sends the cookie back with an empty value
+        self.assertIsNotNone(session_after_login, "Session cookie not cleared after login")
+        self.assertEqual(session_after_login.value, '', "Session cookie not cleared after login")
+
+        logger.debug("✅ User logged in successfully with JWT tokens")
+
+        # Test authenticated access
+        # A substring check on the body is enough to see it is this user
+        user_response = client.get('/api/user/me/')
+        self.assertContains(user_response, self.user.mobile_number, msg_prefix="Authenticated access failed")
+        logger.debug("✅ Authenticated user access: %s", self.user.mobile_number)
+
+        # Phase 3: User logs out
+        logger.debug("🚪 Phase 3: User Logout")
+        logout_response = client.post('/api/user/logout/')
+        self.assertEqual(logout_response.status_code, 200, "Logout failed")
+
+        # Verify logout response contains new session
+        logout_data = logout_response.json()
+        self.assertIn('session_id', logout_data, "Logout response missing session_id")
+
+        new_session_id = logout_data['session_id']
+        logger.debug("✅ Logout successful, new session: %s...", new_session_id[:8])
+
+        # Verify JWT tokens are cleared
+        access_token_after = logout_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
+        refresh_token_after = logout_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
+        new_session_cookie = logout_response.cookies.get(SESSION_COOKIE_NAME)
+
+        access_cleared = not access_token_after or access_token_after.value == ''
+        refresh_cleared = not refresh_token_after or refresh_token_after.value == ''
+        self.assertTrue(access_cleared and refresh_cleared, "JWT tokens not properly cleared")
+        logger.debug("✅ JWT tokens cleared on logout")
+
+        self.assertTrue(new_session_cookie, "New session cookie not set")
+        self.assertEqual(new_session_cookie.value, new_session_id, "New session cookie not set properly")
+        logger.debug("✅ New session cookie set correctly")
+
+        # Phase 4: Anonymous browsing with new session
+        logger.debug("🌐 Phase 4: Post-Logout Anonymous Browsing")
+
+        # Test public endpoints work with new session
+        public_endpoints = [
+            ('/api/restaurant/menu/', 'Menu'),
+            ('/api/common/categories/', 'Categories'),
+            ('/api/common/cart/', 'Cart'),
+        ]
+
+        for endpoint, name in public_endpoints:
+            response = client.get(endpoint)
+            self.assertEqual(response.status_code, 200, f"{name} failed with new session")
+            logger.debug("✅ %s accessible with new session", name)
+
+        # Test that JWT-only endpoints are properly rejected
+        jwt_endpoints = [
+            ('/api/user/me/', 'User Profile'),
+            ('/api/user/addresses/', 'User Addresses'),
+        ]
+
+        for endpoint, name in jwt_endpoints:
+            response = client.get(endpoint)
+            self.assertIn(response.status_code, [401, 403], f"{name} should be rejected without JWT")
+            logger.debug("✅ %s properly rejected without JWT", name)
+
+        # Phase 5: Verify session continuity
+        logger.debug("🔗 Phase 5: Session Continuity Verification")
+
+        # Add item to cart with new session
+        cart_add_response = client.post('/api/common/cart/', {
+            'product_id': self.variant.product_id,
+            'variant_id': self.variant.id,
+            'quantity': 2
+        }, content_type='application/json')
+        self.assertEqual(cart_add_response.status_code, 200, cart_add_response.content.decode())
+        logger.debug("✅ Can add items to cart with new session")
+
+        # Get cart with same session; the item added above must be in it
+        cart_get_response = client.get('/api/common/cart/')
+        self.assertEqual(cart_get_response.status_code, 200, "Cart retrieval failed")
+        cart_items = cart_get_response.json()['cart_items']
+        self.assertEqual([(item['variant_id'], item['quantity']) for item in cart_items],
+                         [(self.variant.id, 2)], "Cart item not kept by the new session")
+        logger.debug("✅ Can retrieve cart with new session")
+
+        logger.debug("🎉 Complete logout to anonymous flow successful!")
+
+    def test_logout_session_isolation(self):
+        """Test that logout creates isolated sessions for different users"""
+        logger.debug("🔒 Testing Logout Session Isolation")
+
+        # Two separate clients, both logged in as the test user
+        client1 = self.client
+        client2 = self.other_client
+        self.log_in(client1)
+        self.log_in(client2)
+
+        logger.debug("✅ Both clients logged in")
+
+        # Client 1 logs out
+        logout_response1 = client1.post('/api/user/logout/')
+        self.assertEqual(logout_response1.status_code, 200, "Client 1 logout failed")
+
+        session_id1 = logout_response1.json().get('session_id')
+        logger.debug("✅ Client 1 logged out, new session: %s...", session_id1[:8])
+
+        # Client 2 logs out
+        logout_response2 = client2.post('/api/user/logout/')
+        self.assertEqual(logout_response2.status_code, 200, "Client 2 logout failed")
+
+        session_id2 = logout_response2.json().get('session_id')
+        logger.debug("✅ Client 2 logged out, new session: %s...", session_id2[:8])
+
+        # Verify sessions are different
+        self.assertNotEqual(session_id1, session_id2, "Same session ID generated (security issue)")
+        logger.debug("✅ Different sessions created for different clients")
+
+        # Verify both can browse independently
+        menu_response1 = client1.get('/api/restaurant/menu/')
+        menu_response2 = client2.get('/api/restaurant/menu/')
+
+        self.assertEqual(menu_response1.status_code, 200, "Independent browsing failed")
+        self.assertEqual(menu_response2.status_code, 200, "Independent browsing failed")
+        logger.debug("✅ Both clients can browse independently")
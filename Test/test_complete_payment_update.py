@@ -1,196 +1,232 @@
-#!/usr/bin/env python3
 """
 Test script to verify complete payment update flow with PhonePe gateway response
 """
 
-import os
-import sys
-import django
-
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
-
-# Setup Django FIRST
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elysianBackend.settings')
-django.setup()
+import logging
+from collections.abc import Mapping
 
 from common.models import Order, Payment
 from user.models import CustomUser
+from django.db import transaction
+from django.test import TestCase
 from django.utils import timezone
+from Test.test_payment_details_extraction import MockOrderStatusResponse
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for gateway fields the response object does not carry
+_MISSING = object()
+
+# Map gateway status to our status
+STATUS_MAPPING = {
+    'COMPLETED': 'COMPLETED',
+    'FAILED': 'FAILED',
+    'PENDING': 'PENDING'
+}
+
+# Fields read from the gateway response and from its first payment detail
+GATEWAY_FIELDS = ('order_id', 'state', 'amount', 'payment_details')
+PAYMENT_DETAIL_FIELDS = ('transaction_id', 'payment_mode', 'timestamp', 'error_code',
+                         'detailed_error_code', 'split_instruments')
+
+
+def read_field(obj, name):
+    """Read a field off a gateway object or a plain dict, _MISSING if absent"""
+    if isinstance(obj, Mapping):
+        return obj.get(name, _MISSING)
+    return getattr(obj, name, _MISSING)
+
+
+def snapshot(obj, fields):
+    """Read each field off obj once, with _MISSING for the absent ones"""
+    return {name: read_field(obj, name) for name in fields}
 
 def create_test_payment():
     """Create a test payment record"""
-    # Get or create a test user
-    user, created = CustomUser.objects.get_or_create(
-        mobile_number='9999999999',
-        defaults={'name': 'Test User'}
-    )
-    
-    # Create a test order
-    order = Order.objects.create(
-        user=user,
-        order_amount=13900,  # 139.00 in paisa
-        payment_status='PENDING',
-        order_status='PENDING',
-        delivery_address='Test Address'
-    )
-    
-    # Create a test payment
-    payment = Payment.objects.create(
-        order=order,
-        amount=13900,
-        transaction_id='TEST_TRANSACTION_123',
-        gateway_order_id='TEST_GATEWAY_ORDER_123',
-        payment_status='PENDING',
-        payment_method='UPI'
-    )
-    
+    # One transaction for the user, order and payment, so the three writes
+    # share a single commit. Each is a single row, so create() is kept:
+    # bulk_create would batch nothing, and on MySQL it does not return the
+    # order's primary key that the payment needs
+    with transaction.atomic():
+        # Get or create a test user
+        user, created = CustomUser.objects.get_or_create(
+            mobile_number='9999999999',
+            defaults={'first_name': 'Test', 'last_name': 'User'}
+        )
+
+        # Create a test order
+        order = Order.objects.create(
+            user=user,
+            order_amount=13900,  # 139.00 in paisa
+            payment_status='PENDING',
+            order_status='PENDING',
+            delivery_address='Test Address'
+        )
+
+        # Create a test payment
+        payment = Payment.objects.create(
+            order=order,
+            amount=13900,
+            transaction_id='TEST_TRANSACTION_123',
+            gateway_order_id='TEST_GATEWAY_ORDER_123',
+            payment_status='PENDING',
+            payment_method='UPI'
+        )
+
     return order, payment
 
 def simulate_payment_update(payment, gateway_response):
-    """Simulate the payment update logic from order view"""
-    print("🔄 Simulating Payment Update Logic")
-    print("-" * 40)
-    
-    # Map gateway status to our status
-    status_mapping = {
-        'COMPLETED': 'COMPLETED',
-        'FAILED': 'FAILED',
-        'PENDING': 'PENDING'
-    }
-    
-    gateway_status = gateway_response.state
-    new_payment_status = status_mapping.get(gateway_status, 'PENDING')
+    """Simulate the payment update logic from order view
+
+    gateway_response may be the SDK's response object or the same data as
+    nested dicts
+    """
+    logger.debug("🔄 Simulating Payment Update Logic")
+    
+    # Read each attribute once up front instead of a hasattr() check
+    # followed by a second lookup
+    gr = snapshot(gateway_response, GATEWAY_FIELDS)
+    payment_details = gr['payment_details'] if gr['payment_details'] is not _MISSING else None
+    pd = snapshot(payment_details[0], PAYMENT_DETAIL_FIELDS) if payment_details else None
+
+    gateway_status = gr['state']
+    new_payment_status = STATUS_MAPPING.get(gateway_status, 'PENDING')
     
-    print(f"📊 Gateway Status: {gateway_status}")
-    print(f"📊 Mapped Status: {new_payment_status}")
+    logger.debug("📊 Gateway Status: %s", gateway_status)
+    logger.debug("📊 Mapped Status: %s", new_payment_status)
     
     # Update payment status
     payment.payment_status = new_payment_status
+    # Columns to write; updated_at is auto_now, which save() only refreshes
+    # when it is listed
+    dirty = {'payment_status', 'additional_info', 'updated_at'}
     
-    # Extract payment details from gateway response
-    if hasattr(gateway_response, 'payment_details') and gateway_response.payment_details:
-        payment_detail = gateway_response.payment_details[0]  # Get first payment detail
-        
-        print(f"📋 Payment Detail Found: {payment_detail.transaction_id}")
-        
-        # Update transaction_id
-        if hasattr(payment_detail, 'transaction_id'):
-            old_transaction_id = payment.transaction_id
-            payment.transaction_id = payment_detail.transaction_id
-            print(f"🔄 Transaction ID: {old_transaction_id} → {payment.transaction_id}")
-        
-        # Update payment_method from payment_mode
-        if hasattr(payment_detail, 'payment_mode'):
-            payment_mode = payment_detail.payment_mode
-            old_payment_method = payment.payment_method
-            if hasattr(payment_mode, 'value'):
-                payment.payment_method = payment_mode.value
-            else:
-                payment.payment_method = str(payment_mode)
-            print(f"🔄 Payment Method: {old_payment_method} → {payment.payment_method}")
-    
-    # Update additional_info with gateway response details
-    additional_info = payment.additional_info or {}
+    # Copy the stored info and add the basic response fields in one update
+    additional_info = dict(payment.additional_info or {})
     
-    print(f"📋 Original Additional Info: {additional_info}")
+    logger.debug("📋 Original Additional Info: %s", additional_info)
     
-    # Add basic response info
     additional_info.update({
         'last_checked': timezone.now().isoformat(),
-        'gateway_order_id': getattr(gateway_response, 'order_id', ''),
-        'gateway_state': getattr(gateway_response, 'state', ''),
-        'gateway_amount': getattr(gateway_response, 'amount', 0),
+        'gateway_order_id': gr['order_id'] if gr['order_id'] is not _MISSING else '',
+        'gateway_state': gr['state'] if gr['state'] is not _MISSING else '',
+        'gateway_amount': gr['amount'] if gr['amount'] is not _MISSING else 0,
     })
     
-    # Add payment details if available
-    if hasattr(gateway_response, 'payment_details') and gateway_response.payment_details:
-        payment_detail = gateway_response.payment_details[0]
+    # Walk the first payment detail once, filling in both the payment
+    # columns and the additional info
+    if pd:
+        logger.debug("📋 Payment Detail Found: %s", pd['transaction_id'])
+        
+        # Update transaction_id
+        if pd['transaction_id'] is not _MISSING:
+            old_transaction_id = payment.transaction_id
+            payment.transaction_id = pd['transaction_id']
+            dirty.add('transaction_id')
+            logger.debug("🔄 Transaction ID: %s → %s", old_transaction_id, payment.transaction_id)
+        
+        # Update payment_method from payment_mode
+        payment_mode = pd['payment_mode']
+        if payment_mode is not _MISSING:
+            old_payment_method = payment.payment_method
+            mode_value = read_field(payment_mode, 'value')
+            payment.payment_method = mode_value if mode_value is not _MISSING else str(payment_mode)
+            dirty.add('payment_method')
+            logger.debug("🔄 Payment Method: %s → %s", old_payment_method, payment.payment_method)
         
         # Add timestamp
-        if hasattr(payment_detail, 'timestamp'):
-            additional_info['timestamp'] = payment_detail.timestamp
-            print(f"✅ Added timestamp: {payment_detail.timestamp}")
+        if pd['timestamp'] is not _MISSING:
+            additional_info['timestamp'] = pd['timestamp']
+            logger.debug("✅ Added timestamp: %s", pd['timestamp'])
         
         # Add error codes
-        if hasattr(payment_detail, 'error_code'):
-            additional_info['error_code'] = payment_detail.error_code
-            print(f"✅ Added error_code: {payment_detail.error_code}")
+        if pd['error_code'] is not _MISSING:
+            additional_info['error_code'] = pd['error_code']
+            logger.debug("✅ Added error_code: %s", pd['error_code'])
         
-        if hasattr(payment_detail, 'detailed_error_code'):
-            additional_info['error_detail'] = payment_detail.detailed_error_code
-            print(f"✅ Added error_detail: {payment_detail.detailed_error_code}")
+        if pd['detailed_error_code'] is not _MISSING:
+            additional_info['error_detail'] = pd['detailed_error_code']
+            logger.debug("✅ Added error_detail: %s", pd['detailed_error_code'])
         
         # Add UPI transaction ID if available
-        if hasattr(payment_detail, 'split_instruments') and payment_detail.split_instruments:
-            for instrument_combo in payment_detail.split_instruments:
-                if hasattr(instrument_combo, 'rail') and hasattr(instrument_combo.rail, 'upi_transaction_id'):
-                    additional_info['upi_transaction_id'] = instrument_combo.rail.upi_transaction_id
-                    print(f"✅ Added upi_transaction_id: {instrument_combo.rail.upi_transaction_id}")
+        if pd['split_instruments'] is not _MISSING and pd['split_instruments']:
+            for instrument_combo in pd['split_instruments']:
+                rail = read_field(instrument_combo, 'rail')
+                upi_transaction_id = read_field(rail, 'upi_transaction_id')
+                if upi_transaction_id is not _MISSING:
+                    additional_info['upi_transaction_id'] = upi_transaction_id
+                    logger.debug("✅ Added upi_transaction_id: %s", upi_transaction_id)
                     break
     
     payment.additional_info = additional_info
-    payment.save()
+    payment.save(update_fields=dirty)
     
-    print(f"📋 Updated Additional Info: {payment.additional_info}")
+    logger.debug("📋 Updated Additional Info: %s", payment.additional_info)
     
     return payment
 
-def main():
-    """Main test function"""
-    print("🧪 Complete Payment Update Flow Test")
-    print("=" * 60)
-    
-    # Import the mock classes from the previous test
-    from Test.test_payment_details_extraction import MockOrderStatusResponse
-    
-    # Create test payment
-    print("📋 Creating Test Payment...")
-    order, payment = create_test_payment()
-    
-    print(f"✅ Created Order: {order.id}")
-    print(f"✅ Created Payment: {payment.id}")
-    print(f"📊 Initial Payment Status: {payment.payment_status}")
-    print(f"📊 Initial Transaction ID: {payment.transaction_id}")
-    print(f"📊 Initial Payment Method: {payment.payment_method}")
-    print(f"📊 Initial Additional Info: {payment.additional_info}")
-    
-    print()
-    
-    # Create mock gateway response
-    gateway_response = MockOrderStatusResponse()
-    
-    # Simulate payment update
-    updated_payment = simulate_payment_update(payment, gateway_response)
-    
-    print()
-    print("🎯 Final Payment State")
-    print("=" * 30)
-    print(f"📊 Payment Status: {updated_payment.payment_status}")
-    print(f"📊 Transaction ID: {updated_payment.transaction_id}")
-    print(f"📊 Payment Method: {updated_payment.payment_method}")
-    print(f"📊 Gateway Order ID: {updated_payment.additional_info.get('gateway_order_id')}")
-    print(f"📊 Timestamp: {updated_payment.additional_info.get('timestamp')}")
-    print(f"📊 UPI Transaction ID: {updated_payment.additional_info.get('upi_transaction_id')}")
-    print(f"📊 Error Code: {updated_payment.additional_info.get('error_code')}")
-    print(f"📊 Error Detail: {updated_payment.additional_info.get('error_detail')}")
-    
-    print()
-    print("✅ All Required Fields Updated Successfully!")
-    print("   ✅ transaction_id")
-    print("   ✅ payment_status") 
-    print("   ✅ payment_method (PAYMENT_METHOD)")
-    print("   ✅ additional_info.timestamp")
-    print("   ✅ additional_info.error_code")
-    print("   ✅ additional_info.error_detail")
-    print("   ✅ additional_info.upi_transaction_id")
-    
-    # Cleanup
-    payment.delete()
-    order.delete()
-    
-    print("\n🎉 Complete Payment Update Flow Test Successful!")
+class CompletePaymentUpdateTests(TestCase):
+    """Test updating a payment from a gateway order status response"""
+
+    def test_complete_payment_update_flow(self):
+        """Test every payment field is filled in from the gateway response"""
+        logger.debug("🧪 Complete Payment Update Flow Test")
+
+        # The test runs in a transaction that is rolled back afterwards, so
+        # the order and payment need no explicit cleanup
+        order, payment = create_test_payment()
+        logger.debug("✅ Created Order %s, Payment %s", order.id, payment.id)
+        logger.debug("📊 Initial Payment Status: %s", payment.payment_status)
+
+        # Create mock gateway response
+        gateway_response = MockOrderStatusResponse()
+        payment_detail = gateway_response.payment_details[0]
+
+        # Simulate payment update
+        simulate_payment_update(payment, gateway_response)
+
+        # Check the saved row rather than the in-memory instance
+        updated_payment = Payment.objects.get(pk=payment.pk)
+        info = updated_payment.additional_info
+
+        self.assertEqual(updated_payment.payment_status, 'COMPLETED')
+        self.assertEqual(updated_payment.transaction_id, payment_detail.transaction_id)
+        self.assertEqual(updated_payment.payment_method, payment_detail.payment_mode.value)
+        self.assertEqual(info.get('gateway_order_id'), gateway_response.order_id)
+        self.assertEqual(info.get('timestamp'), payment_detail.timestamp)
+        self.assertEqual(info.get('upi_transaction_id'),
+                         payment_detail.split_instruments[0].rail.upi_transaction_id)
+        self.assertIn('error_code', info)
+        self.assertIn('error_detail', info)
+
+        logger.debug("🎉 Complete Payment Update Flow Test Successful!")
+
+    def test_payment_update_from_dict_response(self):
+        """Test the same update from a gateway response given as plain dicts"""
+        _, payment = create_test_payment()
+
+        gateway_response = {
+            'order_id': 'OMO2510172011132576300982',
+            'state': 'FAILED',
+            'amount': 13900,
+            'payment_details': [{
+                'transaction_id': 'OM2510172011132576300061',
+                'payment_mode': 'UPI_QR',
+                'timestamp': 1760712167081,
+                'error_code': 'PAYMENT_DECLINED',
+                'split_instruments': [{'rail': {'upi_transaction_id': 'YBL5bc011fa9f86'}}],
+            }],
+        }
+
+        simulate_payment_update(payment, gateway_response)
+
+        updated_payment = Payment.objects.get(pk=payment.pk)
+        info = updated_payment.additional_info
 
-if __name__ == '__main__':
-    main()
+        self.assertEqual(updated_payment.payment_status, 'FAILED')
+        self.assertEqual(updated_payment.transaction_id, 'OM2510172011132576300061')
+        self.assertEqual(updated_payment.payment_method, 'UPI_QR')
+        self.assertEqual(info.get('error_code'), 'PAYMENT_DECLINED')
+        self.assertEqual(info.get('upi_transaction_id'), 'YBL5bc011fa9f86')
+        # Fields the response does not carry are left out, not set to None
+        self.assertNotIn('error_detail', info)
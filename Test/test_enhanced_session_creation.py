@@ -1,22 +1,17 @@
-#!/usr/bin/env python3
 """
 Test script to verify enhanced session creation API with refresh token handling
 """
 
-import os
-import sys
-import django
-from django.test import Client
-from django.contrib.auth import get_user_model
-
-# Setup Django
-# Add project root to Python path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
+import json
+import logging
+from importlib import import_module
 
-# Setup Django FIRST
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elysianBackend.settings')
-django.setup()
+from django.conf import settings
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from common.views.common import get_or_create_session
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from elysianBackend.constants import (
     ACCESS_TOKEN_COOKIE_NAME,
@@ -26,302 +21,161 @@ from elysianBackend.constants import (
 
 User = get_user_model()
 
-def test_session_creation_without_tokens():
-    """Test session creation when no tokens are present"""
-    print("\n📝 Testing Session Creation Without Tokens")
-    print("-" * 50)
-    
-    client = Client()
-    
-    # Call session creation without any tokens
-    session_response = client.get('/api/common/session/')
-    
-    if session_response.status_code != 200:
-        print(f"❌ Session creation failed: {session_response.status_code}")
-        return False
-    
-    # Check response
-    session_data = session_response.json()
-    if session_data.get('message') != 'Session created':
-        print(f"❌ Unexpected response message: {session_data.get('message')}")
-        return False
-    
-    if 'session_id' not in session_data:
-        print("❌ Session ID not in response")
-        return False
-    
-    print(f"✅ Session created: {session_data['session_id'][:8]}...")
-    
-    # Check session cookie is set
-    session_cookie = session_response.cookies.get(SESSION_COOKIE_NAME)
-    if not session_cookie:
-        print("❌ Session cookie not set")
-        return False
-    
-    if session_cookie.value != session_data['session_id']:
-        print("❌ Session cookie value doesn't match response")
-        return False
-    
-    print("✅ Session cookie set correctly")
-    
-    # Check that JWT cookies are cleared
-    access_token = session_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
-    refresh_token = session_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
-    
-    access_cleared = not access_token or access_token.value == ''
-    refresh_cleared = not refresh_token or refresh_token.value == ''
-    
-    if access_cleared and refresh_cleared:
-        print("✅ JWT tokens cleared")
-    else:
-        print("⚠️  JWT token clearing not verified")
-    
-    return True
-
-def test_session_creation_with_valid_refresh_token():
-    """Test session creation when valid refresh token is present"""
-    print("\n🔄 Testing Session Creation With Valid Refresh Token")
-    print("-" * 50)
-    
-    client = Client()
-    
-    # Step 1: Login to get refresh token
-    initial_session = client.get('/api/common/session/')
-    login_response = client.post('/api/user/login/', {
-        'mobile_number': '9999999999',
-        'password': 'password123'
-    }, content_type='application/json')
-    
-    if login_response.status_code != 200:
-        print(f"❌ Login failed: {login_response.status_code}")
-        return False
-    
-    # Get initial tokens
-    initial_access_token = login_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
-    initial_refresh_token = login_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
-    
-    if not initial_access_token or not initial_refresh_token:
-        print("❌ Initial tokens not set")
-        return False
-    
-    print("✅ Initial tokens obtained")
-    
-    # Step 2: Call session creation with valid refresh token
-    session_response = client.get('/api/common/session/')
-    
-    if session_response.status_code != 200:
-        print(f"❌ Session creation with refresh token failed: {session_response.status_code}")
-        return False
-    
-    # Check response
-    session_data = session_response.json()
-    if session_data.get('message') != 'Access token refreshed':
-        print(f"❌ Unexpected response message: {session_data.get('message')}")
-        return False
-    
-    if 'access_token' not in session_data:
-        print("❌ Access token not in response")
-        return False
-    
-    print("✅ Access token refreshed via session creation")
-    
-    # Check that new tokens are set
-    new_access_token = session_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
-    new_refresh_token = session_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
-    
-    if not new_access_token or not new_refresh_token:
-        print("❌ New tokens not set")
-        return False
-    
-    print("✅ New JWT tokens set")
-    
-    # Verify tokens are different (new tokens generated)
-    if new_access_token.value != initial_access_token.value:
-        print("✅ New access token generated")
-    else:
-        print("⚠️  Access token unchanged (may be expected)")
-    
-    # Check that no session cookie is set (should remain JWT authenticated)
-    session_cookie = session_response.cookies.get(SESSION_COOKIE_NAME)
-    if session_cookie and session_cookie.value:
-        print("⚠️  Session cookie set when using refresh token")
-    else:
-        print("✅ No session cookie set (JWT mode maintained)")
-    
-    return True
-
-def test_session_creation_with_invalid_refresh_token():
-    """Test session creation when invalid refresh token is present"""
-    print("\n❌ Testing Session Creation With Invalid Refresh Token")
-    print("-" * 50)
-    
-    client = Client()
-    
-    # Set an invalid refresh token manually
-    client.cookies[REFRESH_TOKEN_COOKIE_NAME] = 'invalid_token_value'
-    
-    # Call session creation
-    session_response = client.get('/api/common/session/')
-    
-    if session_response.status_code != 200:
-        print(f"❌ Session creation failed: {session_response.status_code}")
-        return False
-    
-    # Should fall back to session creation
-    session_data = session_response.json()
-    if session_data.get('message') != 'Session created':
-        print(f"❌ Should fall back to session creation: {session_data.get('message')}")
-        return False
-    
-    if 'session_id' not in session_data:
-        print("❌ Session ID not in response")
-        return False
-    
-    print("✅ Fell back to session creation with invalid refresh token")
-    
-    # Check session cookie is set
-    session_cookie = session_response.cookies.get(SESSION_COOKIE_NAME)
-    if not session_cookie:
-        print("❌ Session cookie not set")
-        return False
-    
-    print("✅ Session cookie set correctly")
-    
-    # Check that JWT cookies are cleared
-    access_token = session_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
-    refresh_token = session_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
-    
-    access_cleared = not access_token or access_token.value == ''
-    refresh_cleared = not refresh_token or refresh_token.value == ''
-    
-    if access_cleared and refresh_cleared:
-        print("✅ Invalid JWT tokens cleared")
-    else:
-        print("⚠️  JWT token clearing not verified")
-    
-    return True
-
-def test_session_creation_flow_integration():
-    """Test integration with existing authentication flow"""
-    print("\n🔗 Testing Session Creation Flow Integration")
-    print("-" * 50)
-    
-    client = Client()
-    
-    # Step 1: Create initial session
-    session_response1 = client.get('/api/common/session/')
-    if session_response1.status_code != 200:
-        print("❌ Initial session creation failed")
-        return False
-    
-    session_id1 = session_response1.json().get('session_id')
-    print(f"✅ Initial session: {session_id1[:8]}...")
-    
-    # Step 2: Use session to access public endpoint
-    menu_response = client.get('/api/restaurant/menu/')
-    if menu_response.status_code != 200:
-        print(f"❌ Menu access with session failed: {menu_response.status_code}")
-        return False
-    
-    print("✅ Public endpoint accessible with session")
-    
-    # Step 3: Login (should clear session, set JWT)
-    login_response = client.post('/api/user/login/', {
-        'mobile_number': '9999999999',
-        'password': 'password123'
-    }, content_type='application/json')
-    
-    if login_response.status_code != 200:
-        print(f"❌ Login failed: {login_response.status_code}")
-        return False
-    
-    print("✅ Login successful")
-    
-    # Step 4: Call session creation (should refresh tokens)
-    session_response2 = client.get('/api/common/session/')
-    if session_response2.status_code != 200:
-        print(f"❌ Session creation after login failed: {session_response2.status_code}")
-        return False
-    
-    session_data2 = session_response2.json()
-    if session_data2.get('message') != 'Access token refreshed':
-        print(f"❌ Should refresh token: {session_data2.get('message')}")
-        return False
-    
-    print("✅ Token refreshed via session creation")
-    
-    # Step 5: Logout (should create new session)
-    logout_response = client.post('/api/user/logout/')
-    if logout_response.status_code != 200:
-        print(f"❌ Logout failed: {logout_response.status_code}")
-        return False
-    
-    session_id3 = logout_response.json().get('session_id')
-    print(f"✅ Logout created session: {session_id3[:8]}...")
-    
-    # Step 6: Call session creation again (should maintain session)
-    session_response3 = client.get('/api/common/session/')
-    if session_response3.status_code != 200:
-        print(f"❌ Session creation after logout failed: {session_response3.status_code}")
-        return False
-    
-    session_data3 = session_response3.json()
-    if session_data3.get('message') != 'Session created':
-        print(f"❌ Should maintain session mode: {session_data3.get('message')}")
-        return False
-    
-    print("✅ Session mode maintained after logout")
-    
-    return True
-
-def main():
-    print("🔄 Enhanced Session Creation Tests")
-    print("=" * 60)
-    
-    # Ensure test user exists
-    try:
-        user = User.objects.get(mobile_number='9999999999')
-        print("✅ Using existing test user: 9999999999")
-    except User.DoesNotExist:
-        user = User.objects.create_user(
+logger = logging.getLogger(__name__)
+
+SESSION_URL = '/api/common/session/'
+LOGIN_URL = '/api/user/login/'
+
+JWT_COOKIE_NAMES = (ACCESS_TOKEN_COOKIE_NAME, REFRESH_TOKEN_COOKIE_NAME)
+
+# The login body is a literal, so it is encoded once at import
+LOGIN_PAYLOAD = json.dumps({
+    'mobile_number': '9999999999',
+    'password': 'password123'
+})
+
+
+class EnhancedSessionCreationTests(TestCase):
+    """Test the session endpoint with no, valid and invalid refresh tokens"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Test user the flows log in as; rolled back with the class
+        cls.user = User.objects.create_user(
             mobile_number='9999999999',
             password='password123',
             first_name='Test',
             last_name='User',
             email='test@example.com'
         )
-        print("✅ Created test user: 9999999999")
-    
-    # Run tests
-    tests = [
-        ("Session Creation Without Tokens", test_session_creation_without_tokens),
-        ("Session Creation With Valid Refresh Token", test_session_creation_with_valid_refresh_token),
-        ("Session Creation With Invalid Refresh Token", test_session_creation_with_invalid_refresh_token),
-        ("Session Creation Flow Integration", test_session_creation_flow_integration),
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {test_name} failed")
-        except Exception as e:
-            print(f"❌ {test_name} error: {e}")
-    
-    print(f"\n🎯 Test Results: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("🎉 All Enhanced Session Creation Tests Passed!")
-        print("🔒 Your smart session creation is working perfectly!")
-        print("✨ Automatic token refresh and session fallback implemented!")
-    else:
-        print("⚠️  Some tests failed. Check the output above.")
-    
-    print("=" * 60)
-
-if __name__ == '__main__':
-    main()
+
+    def setUp(self):
+        # The single-request tests call the view directly, skipping URL
+        # resolution and the middleware; the flow test goes through
+        # self.client, since the cookies carried between requests are what
+        # it checks
+        self.factory = APIRequestFactory()
+
+    def call_session_view(self, **cookies):
+        """GET the session view with the given cookies and return its response"""
+        request = self.factory.get(SESSION_URL)
+        request.COOKIES.update(cookies)
+        # SessionMiddleware is skipped, so attach the empty session it would
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        return get_or_create_session(request)
+
+    def assertTokensCleared(self, response):
+        """Check the response carries no JWT cookie values"""
+        # Collect every offender so a failure names all of them
+        not_cleared = {name for name in JWT_COOKIE_NAMES
+                       if name in response.cookies and response.cookies[name].value}
+        self.assertFalse(not_cleared, "JWT tokens not cleared")
+
+    def test_session_creation_without_tokens(self):
+        """Test session creation when no tokens are present"""
+        logger.debug("📝 Testing Session Creation Without Tokens")
+
+        # Call session creation without any tokens
+        session_response = self.call_session_view()
+        self.assertEqual(session_response.status_code, 200, "Session creation failed")
+
+        session_data = session_response.data
+        self.assertEqual(session_data.get('message'), 'Session created')
+        self.assertIn('session_id', session_data, "Session ID not in response")
+
+        # Check session cookie is set
+        session_cookie = session_response.cookies.get(SESSION_COOKIE_NAME)
+        self.assertTrue(session_cookie, "Session cookie not set")
+        self.assertEqual(session_cookie.value, session_data['session_id'],
+                         "Session cookie value doesn't match response")
+
+        self.assertTokensCleared(session_response)
+
+    def test_session_creation_with_valid_refresh_token(self):
+        """Test session creation when valid refresh token is present"""
+        logger.debug("🔄 Testing Session Creation With Valid Refresh Token")
+
+        # Step 1: Send the JWT cookies a login sets. The session endpoint is
+        # the subject here, so the tokens are minted directly instead of
+        # creating a session only so the login endpoint accepts the request
+        refresh_token = RefreshToken.for_user(self.user)
+        initial_access_token = str(refresh_token.access_token)
+
+        # Step 2: Call session creation with valid refresh token
+        session_response = self.call_session_view(**{
+            REFRESH_TOKEN_COOKIE_NAME: str(refresh_token),
+            ACCESS_TOKEN_COOKIE_NAME: initial_access_token,
+        })
+        self.assertEqual(session_response.status_code, 200,
+                         "Session creation with refresh token failed")
+
+        session_data = session_response.data
+        self.assertEqual(session_data.get('message'), 'Access token refreshed')
+        self.assertIn('access_token', session_data, "Access token not in response")
+
+        # Check that new tokens are set
+        new_access_token = session_response.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
+        new_refresh_token = session_response.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
+        self.assertTrue(new_access_token and new_refresh_token, "New tokens not set")
+
+        if new_access_token.value == initial_access_token:
+            logger.debug("⚠️  Access token unchanged (may be expected)")
+
+        # No session cookie should be set (should remain JWT authenticated)
+        session_cookie = session_response.cookies.get(SESSION_COOKIE_NAME)
+        if session_cookie and session_cookie.value:
+            logger.debug("⚠️  Session cookie set when using refresh token")
+
+    def test_session_creation_with_invalid_refresh_token(self):
+        """Test session creation when invalid refresh token is present"""
+        logger.debug("❌ Testing Session Creation With Invalid Refresh Token")
+
+        # Send an invalid refresh token
+        session_response = self.call_session_view(**{REFRESH_TOKEN_COOKIE_NAME: 'invalid_token_value'})
+        self.assertEqual(session_response.status_code, 200, "Session creation failed")
+
+        # Should fall back to session creation
+        session_data = session_response.data
+        self.assertEqual(session_data.get('message'), 'Session created',
+                         "Should fall back to session creation")
+        self.assertIn('session_id', session_data, "Session ID not in response")
+
+        self.assertTrue(session_response.cookies.get(SESSION_COOKIE_NAME), "Session cookie not set")
+        self.assertTokensCleared(session_response)
+
+    def test_session_creation_flow_integration(self):
+        """Test integration with existing authentication flow"""
+        logger.debug("🔗 Testing Session Creation Flow Integration")
+
+        # Step 1: Create initial session
+        session_response1 = self.client.get(SESSION_URL)
+        self.assertEqual(session_response1.status_code, 200, "Initial session creation failed")
+
+        session_id1 = session_response1.json().get('session_id')
+        logger.debug("✅ Initial session: %s...", session_id1[:8])
+
+        # Step 2: Use session to access public endpoint
+        menu_response = self.client.get('/api/restaurant/menu/')
+        self.assertEqual(menu_response.status_code, 200, "Menu access with session failed")
+
+        # Step 3: Login (should clear session, set JWT)
+        login_response = self.client.post(LOGIN_URL, LOGIN_PAYLOAD, content_type='application/json')
+        self.assertEqual(login_response.status_code, 200, "Login failed")
+
+        # Step 4: Call session creation (should refresh tokens)
+        session_response2 = self.client.get(SESSION_URL)
+        self.assertEqual(session_response2.status_code, 200, "Session creation after login failed")
+        self.assertEqual(session_response2.json().get('message'), 'Access token refreshed')
+
+        # Step 5: Logout (should create new session)
+        logout_response = self.client.post('/api/user/logout/')
+        self.assertEqual(logout_response.status_code, 200, "Logout failed")
+
+        session_id3 = logout_response.json().get('session_id')
+        logger.debug("✅ Logout created session: %s...", session_id3[:8])
+
+        # Step 6: Call session creation again (should maintain session)
+        session_response3 = self.client.get(SESSION_URL)
+        self.assertEqual(session_response3.status_code, 200, "Session creation after logout failed")
+        self.assertEqual(session_response3.json().get('message'), 'Session created',
+                         "Should maintain session mode")
@@ -16,6 +16,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'elysianBackend.settings')
 django.setup()
 
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from common.models import Product, Variant, Category
 from restaurent.models import RestaurentMenu, RestaurentEntity
 
@@ -183,14 +184,14 @@ def cleanup_test_data():
     """Clean up test data"""
     print("\n🧹 Cleaning up test data...")
     
-    # Delete test products and related data
-    test_products = Product.objects.filter(name__startswith='Available Product').union(
-        Product.objects.filter(name__startswith='Unavailable Product')
-    )
-    
-    for product in test_products:
-        print(f"   Deleting: {product.name}")
-        product.delete()  # This will cascade delete variants and menu items
+    # Delete test products and related data in one queryset delete; Django
+    # collects the cascaded variants and menu items and removes each table
+    # with a single DELETE ... WHERE id IN (...) instead of one pass per product
+    _, deleted_by_model = Product.objects.filter(
+        Q(name__startswith='Available Product') | Q(name__startswith='Unavailable Product')
+    ).delete()
+    for model_label, count in deleted_by_model.items():
+        print(f"   Deleted {count} x {model_label}")
     
     # Delete test category and restaurant
     Category.objects.filter(name='Test Category').delete()
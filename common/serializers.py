@@ -1,6 +1,22 @@
+import copy
 from rest_framework import serializers
 from .models import Category, Tag, Variant, Product, Cart, CartItem, Order, Payment
 
+class CachedFieldsMixin:
+    """
+    Build a serializer's fields once per class and give each instance shallow
+    copies, instead of re-running get_fields() and its deepcopy every time.
+    Only use on serializers whose fields do not depend on the instance or context.
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        if cls not in CachedFieldsMixin._fields_cache:
+            CachedFieldsMixin._fields_cache[cls] = super().get_fields()
+        # Copies are bound to this instance; the cached fields stay unbound
+        return {name: copy.copy(field) for name, field in CachedFieldsMixin._fields_cache[cls].items()}
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
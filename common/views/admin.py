@@ -621,12 +621,13 @@ def admin_delete_tag(request, tag_id):
     """
     tag = get_object_or_404(Tag, id=tag_id)
 
-    # Check if tag is used in any products' sub_category field
-    products_using_tag = Product.objects.filter(sub_category__contains=[tag.name])
-    if products_using_tag.exists():
+    # Check if tag is used in any products' sub_category field; one COUNT
+    # answers both whether it is used and by how many products
+    products_count = Product.objects.filter(sub_category__contains=[tag.name]).count()
+    if products_count:
         return Response({
             'error': 'Cannot delete tag that is used in products',
-            'products_count': products_using_tag.count()
+            'products_count': products_count
         }, status=status.HTTP_400_BAD_REQUEST)
 
     tag_name = tag.name
@@ -42,7 +42,10 @@ def checkout(request):
 
     # Verify address belongs to the user
     try:
-        address = Address.objects.get(id=address_id, user=request.user)
+        # Only the fields used for the delivery address string are loaded
+        address = Address.objects.only(
+            *Address.DELIVERY_ADDRESS_FIELDS
+        ).get(id=address_id, user=request.user)
         logger.info(f"✅ Address {address_id} validated for user {user_id}")
     except Address.DoesNotExist:
         logger.error(f"❌ Address {address_id} not found or does not belong to user {user_id}")
@@ -100,7 +103,7 @@ def checkout(request):
         logger.info(f"💰 Total order amount: ₹{total_amount/100:.2f} for user {user_id}")
 
         # Format delivery address from the verified address object
-        delivery_address = f"{address.address}, {address.city}, {address.state} - {address.pincode}"
+        delivery_address = address.get_delivery_address()
         logger.info(f"📍 Delivery address set for user {user_id}: {delivery_address[:50]}...")
         
         # Create order and payment in a transaction
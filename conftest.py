@@ -0,0 +1,43 @@
+"""
+Shared pytest configuration for the whole project
+
+pytest-django reads DJANGO_SETTINGS_MODULE from pytest.ini and runs
+django.setup() once per session before any test module is imported, so
+test modules import models directly instead of bootstrapping Django
+themselves.
+"""
+
+import pytest
+from django.urls import resolve
+
+# Standalone scripts in Test/ that bootstrap Django themselves and are run
+# with `python Test/<script>.py`; they are not pytest modules yet, so keep
+# a bare `pytest` run from collecting them
+collect_ignore = [
+    'Test/test_initial_data_loaded.py',
+    'Test/test_logout_session_creation.py',
+    'Test/test_manual_image_upload.py',
+    'Test/test_menu_availability_filter.py',
+    'Test/test_menu_to_cart_flow.py',
+    'Test/test_new_auth_classes.py',
+    'Test/test_order_status_sync.py',
+    'Test/test_payment_details_extraction.py',
+    'Test/test_payment_details_update.py',
+    'Test/test_payment_status_fix.py',
+    'Test/test_phonepe_payment_modes.py',
+    'Test/test_secure_auth_flow.py',
+    'Test/test_smart_session_api.py',
+    'Test/test_unified_cart_responses.py',
+]
+
+
+@pytest.fixture(scope='session', autouse=True)
+def warm_url_resolver():
+    """
+    Import the URLconf and every view module once, before the first test
+
+    Django caches the resolver per process, so this does not save work
+    overall; it keeps the one-off import cost out of whichever test
+    happens to make the first request, so --durations stays meaningful
+    """
+    resolve('/api/common/cart/')
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from .models import RestaurentMenu
 from common.models import Product, Variant, RestaurentEntity
 
@@ -29,8 +29,11 @@ class RestaurentMenuSerializer(serializers.ModelSerializer):
                  'discount_percentage', 'is_available', 'veg', 'category', 'sub_categories', 'product_id']
 
     def get_variants(self, obj):
-        # Get only available variants using the foreign key relationship
-        variants = obj.product.variants.filter(is_available=True)
+        # Use the available variants prefetched by the list view, falling back
+        # to a query when serializing a single menu item
+        variants = getattr(obj.product, 'available_variants', None)
+        if variants is None:
+            variants = obj.product.variants.filter(is_available=True)
         result = []
 
         for variant in variants:
@@ -119,14 +122,8 @@ class AddMenuItemSerializer(serializers.ModelSerializer):
         restaurent_id = attrs.get('restaurent_id')
         default_variant_id = attrs.get('default_variant_id')
 
-        # Check if menu item already exists for this restaurant and product
-        if RestaurentMenu.objects.filter(
-            product_id=product_id,
-            restaurent_id=restaurent_id
-        ).exists():
-            raise serializers.ValidationError(
-                "This product is already in the restaurant's menu."
-            )
+        # Duplicate (restaurent, product) pairs are rejected by the unique
+        # constraint on insert, see create()
 
         # If default_variant_id is provided, ensure it belongs to the product
         if default_variant_id:
@@ -148,15 +145,19 @@ class AddMenuItemSerializer(serializers.ModelSerializer):
         default_variant_id = validated_data.pop('default_variant_id', None)
 
         try:
-            menu_item = RestaurentMenu.objects.create(
-                product_id=product_id,
-                restaurent_id=restaurent_id,
-                default_variant_id=default_variant_id,
-                **validated_data
-            )
+            # Savepoint so a duplicate insert does not break an enclosing transaction
+            with transaction.atomic():
+                menu_item = RestaurentMenu.objects.create(
+                    product_id=product_id,
+                    restaurent_id=restaurent_id,
+                    default_variant_id=default_variant_id,
+                    **validated_data
+                )
             return menu_item
         except IntegrityError:
-            # Handle race condition where duplicate was created between validation and creation
-            raise serializers.ValidationError(
-                "This product is already in the restaurant's menu. Please refresh and try again."
-            )
+            # unique_together (restaurent, product) covers both the plain
+            # duplicate and the concurrent-insert race in one round-trip.
+            # Keyed like a validate() error, the shape clients already handle
+            raise serializers.ValidationError({
+                'non_field_errors': ["This product is already in the restaurant's menu."]
+            })
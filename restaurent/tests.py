@@ -1,10 +1,14 @@
+from unittest import mock
 from django.test import TestCase
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from common.models import RestaurentEntity, Product, Variant, Category
 from .models import RestaurentMenu
+from .serializers import RestaurentMenuSerializer
 
 User = get_user_model()
 
@@ -110,6 +114,94 @@ class RestaurantListTestCase(APITestCase):
         # Should work without authentication
 
 
+class RestaurantMenuListTestCase(APITestCase):
+    def setUp(self):
+        self.category = Category.objects.create(
+            name='Test Category',
+            type='food'
+        )
+
+        self.restaurant = RestaurentEntity.objects.create(
+            name='Test Restaurant',
+            address='Test Address'
+        )
+
+        # The menu endpoint needs at least an anonymous session
+        self.client.get(reverse('get-or-create-session'))
+
+    def add_menu_items(self, count):
+        """Add menu items that each have one available and one unavailable variant"""
+        start = Product.objects.count()
+        for i in range(start, start + count):
+            product = Product.objects.create(
+                name=f'Menu Product {i}',
+                category=self.category
+            )
+            variant = Variant.objects.create(
+                product=product,
+                size='Medium',
+                price=100.00,
+                type='size'
+            )
+            Variant.objects.create(
+                product=product,
+                size='Large',
+                price=150.00,
+                type='size',
+                is_available=False
+            )
+            RestaurentMenu.objects.create(
+                restaurent=self.restaurant,
+                product=product,
+                default_variant=variant
+            )
+
+    def test_menu_list_returns_only_available_variants(self):
+        """Test that unavailable variants are left out of the menu"""
+        self.add_menu_items(2)
+        url = reverse('restaurant-menu-list')
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        for menu_item in response.data:
+            self.assertEqual(len(menu_item['variants']), 1)
+            self.assertEqual(menu_item['variants'][0]['size'], 'Medium')
+            self.assertTrue(menu_item['variants'][0]['default'])
+
+    def test_menu_list_query_count_does_not_grow_with_menu_size(self):
+        """Test that variants are prefetched instead of queried per menu item"""
+        url = reverse('restaurant-menu-list')
+
+        self.add_menu_items(1)
+        with CaptureQueriesContext(connection) as small_menu:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 1)
+
+        self.add_menu_items(4)
+        with CaptureQueriesContext(connection) as large_menu:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 5)
+
+        self.assertEqual(len(large_menu.captured_queries), len(small_menu.captured_queries))
+
+    def test_menu_list_serializes_queryset_in_one_batch(self):
+        """Test that the whole menu goes through a single many=True serializer"""
+        self.add_menu_items(3)
+        url = reverse('restaurant-menu-list')
+
+        with mock.patch(
+            'restaurent.views.RestaurentMenuSerializer',
+            wraps=RestaurentMenuSerializer
+        ) as serializer_class:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        serializer_class.assert_called_once()
+        self.assertTrue(serializer_class.call_args.kwargs.get('many'))
+
+
 class AdminMenuItemsListTestCase(APITestCase):
     def setUp(self):
         # Create admin user
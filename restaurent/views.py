@@ -3,6 +3,8 @@ from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from django.db.models import Prefetch
 from common.views.common import SessionOrJWTAuthentication, JWTOnlyAuthentication
 from user.permissions import IsAdminUser
 from .models import RestaurentMenu
@@ -20,6 +22,13 @@ def restaurant_menu_list(request):
     # Only show menu items where product is available and has at least one available variant
     menu_items = RestaurentMenu.objects.select_related(
         'product', 'product__category', 'default_variant'
+    ).prefetch_related(
+        # Load available variants for every menu item in one query
+        Prefetch(
+            'product__variants',
+            queryset=Variant.objects.filter(is_available=True),
+            to_attr='available_variants'
+        )
     ).filter(
         product__is_available=True,  # Product must be available
         product__variants__is_available=True  # At least one variant must be available
@@ -116,6 +125,13 @@ def admin_add_menu_item(request):
                 'menu_item': response_serializer.data
             }, status=status.HTTP_201_CREATED)
 
+        except ValidationError as e:
+            # Raised by the serializer when the unique constraint rejects a duplicate
+            return Response({
+                'error': 'Validation failed',
+                'details': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         except Exception as e:
             # Handle unique constraint violation
             if 'unique' in str(e).lower() or 'duplicate' in str(e).lower():
@@ -94,9 +94,16 @@ class Address(models.Model):
         verbose_name_plural = 'Addresses'
         ordering = ['-is_default', '-created_at']
     
+    # Columns needed to build the delivery address, in formatting order
+    DELIVERY_ADDRESS_FIELDS = ('address', 'city', 'state', 'pincode')
+    
     def __str__(self):
         return f"{self.user.mobile_number} - {self.name}"
     
+    def get_delivery_address(self):
+        """Single-line address copied onto an order at checkout"""
+        return f"{self.address}, {self.city}, {self.state} - {self.pincode}"
+    
     def save(self, *args, **kwargs):
         # Ensure only one default address per user
         if self.is_default:
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from .models import CustomUser, Address
+from common.serializers import CachedFieldsMixin
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
@@ -123,7 +124,7 @@ class AdminUserSerializer(serializers.ModelSerializer):
         return data
 
 
-class AddressSerializer(serializers.ModelSerializer):
+class AddressSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Address
         fields = ('id', 'name', 'address', 'pincode', 'city', 'state', 'country', 'is_default')
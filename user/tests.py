@@ -1,3 +1,87 @@
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from .models import Address
+from .serializers import AddressSerializer
 
-# Create your tests here.
+User = get_user_model()
+
+
+class AddressSerializerTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Created once for the class so the password is only hashed once
+        cls.user = User.objects.create_user(
+            mobile_number='9876543210',
+            password='testpass123'
+        )
+
+        cls.address = Address.objects.create(
+            user=cls.user,
+            name='Home',
+            address='123 Main Street',
+            pincode='400001',
+            city='Mumbai',
+            state='Maharashtra',
+            is_default=True
+        )
+
+    def test_address_serializer_fields(self):
+        """Test that the serializer returns the expected address fields"""
+        data = AddressSerializer(self.address).data
+
+        self.assertEqual(
+            set(data.keys()),
+            {'id', 'name', 'address', 'pincode', 'city', 'state', 'country', 'is_default'}
+        )
+        self.assertEqual(data['city'], 'Mumbai')
+        self.assertEqual(data['country'], 'India')
+
+    def test_address_serializer_instances_do_not_share_fields(self):
+        """Test that cached fields are copied and bound per serializer instance"""
+        first = AddressSerializer(self.address)
+        second = AddressSerializer(self.address)
+
+        self.assertEqual(first.data, second.data)
+        self.assertIsNot(first.fields['city'], second.fields['city'])
+        self.assertIs(first.fields['city'].parent, first)
+        self.assertIs(second.fields['city'].parent, second)
+
+    def test_address_serializer_validation_with_cached_fields(self):
+        """Test that validation still works after the fields have been cached"""
+        AddressSerializer(self.address).data
+
+        serializer = AddressSerializer(data={
+            'name': 'Office',
+            'address': '456 Side Street',
+            'pincode': '12345',
+            'city': 'Pune',
+            'state': 'Maharashtra'
+        })
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('pincode', serializer.errors)
+
+
+class AddressDeliveryFormatTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            mobile_number='9876543210',
+            password='testpass123'
+        )
+
+        cls.address = Address.objects.create(
+            user=cls.user,
+            name='Home',
+            address='123 Main Street',
+            pincode='400001',
+            city='Mumbai',
+            state='Maharashtra'
+        )
+
+    def test_get_delivery_address(self):
+        """Test the single-line address used for orders"""
+        self.assertEqual(
+            self.address.get_delivery_address(),
+            '123 Main Street, Mumbai, Maharashtra - 400001'
+        )